@@ -1,7 +1,7 @@
 # a1_compat.py
 from __future__ import annotations
 from datetime import date, timedelta
-from typing import Hashable, Dict, Any
+from typing import Hashable, Dict, Any, Iterable
 
 from services import LibraryService, DEFAULT_LOAN_DAYS
 
@@ -38,10 +38,9 @@ def search_books_in_catalog(query: str):
     return _LIB.search_books(query)
 
 def get_patron_status_report(patron_id: int) -> Dict[str, Any]:
-    user = _LIB.users.get(patron_id)
-    loans = _LIB.list_active_loans(patron_id)
-    return {
-        "is_active": bool(user and user.is_active),
-        "active_loans": loans,
-        "total_active_loan_count": sum(cnt for _, cnt in loans),
-    }
+    return _LIB.patron_summary(patron_id)
+
+def get_patron_status_reports(patron_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """Reports for many patrons: one indexed lookup per unique ID, sharing the
+    per-patron cache with get_patron_status_report."""
+    return _LIB.patron_summaries(patron_ids)
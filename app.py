@@ -1,6 +1,7 @@
 import os
 import sqlite3
-from flask import Flask, render_template, request, redirect, url_for, flash
+from datetime import date, timedelta
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
 
 # Path to the SQLite database inside the project
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -45,16 +46,150 @@ def init_db():
         """
     )
 
+    # Circulation rollups, bumped on every borrow so reports never scan `loans`
+    existing = {
+        r[0] for r in cur.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS title_circulation (
+            book_id INTEGER PRIMARY KEY,
+            checkouts INTEGER NOT NULL DEFAULT 0,
+            on_loan INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (book_id) REFERENCES books(id)
+        )
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_title_circulation_checkouts "
+        "ON title_circulation (checkouts DESC)"
+    )
+    # dimension is one of 'total', 'title', 'patron', 'author'
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS daily_circulation (
+            day TEXT NOT NULL,
+            dimension TEXT NOT NULL,
+            key TEXT NOT NULL,
+            checkouts INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, key, day)
+        )
+        """
+    )
+    # all-time checkouts per patron / author (titles live in title_circulation)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS circulation_totals (
+            dimension TEXT NOT NULL,
+            key TEXT NOT NULL,
+            checkouts INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, key)
+        )
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_circulation_totals_checkouts "
+        "ON circulation_totals (dimension, checkouts DESC)"
+    )
+    backfill_rollups(cur, existing)
+
     conn.commit()
     conn.close()
 
 
+def backfill_rollups(cur, existing):
+    """Seed rollup tables created just now from the loans already on record."""
+    # There is no return flow yet, so every recorded loan is still on loan.
+    if "title_circulation" not in existing:
+        cur.execute(
+            """
+            INSERT INTO title_circulation (book_id, checkouts, on_loan)
+            SELECT book_id, COUNT(*), COUNT(*) FROM loans GROUP BY book_id
+            """
+        )
+    if "daily_circulation" not in existing:
+        cur.execute(
+            """
+            INSERT INTO daily_circulation (day, dimension, key, checkouts)
+            SELECT date(loan_date), 'total', '', COUNT(*) FROM loans
+            GROUP BY date(loan_date)
+            UNION ALL
+            SELECT date(loan_date), 'title', CAST(book_id AS TEXT), COUNT(*) FROM loans
+            GROUP BY date(loan_date), book_id
+            UNION ALL
+            SELECT date(loan_date), 'patron', patron_id, COUNT(*) FROM loans
+            GROUP BY date(loan_date), patron_id
+            UNION ALL
+            SELECT date(l.loan_date), 'author', b.author, COUNT(*)
+            FROM loans l JOIN books b ON b.id = l.book_id
+            GROUP BY date(l.loan_date), b.author
+            """
+        )
+    if "circulation_totals" not in existing:
+        cur.execute(
+            """
+            INSERT INTO circulation_totals (dimension, key, checkouts)
+            SELECT 'patron', patron_id, COUNT(*) FROM loans GROUP BY patron_id
+            UNION ALL
+            SELECT 'author', b.author, COUNT(*)
+            FROM loans l JOIN books b ON b.id = l.book_id
+            GROUP BY b.author
+            """
+        )
+
+
+def record_checkout_rollups(cur, book_id, patron_id, author):
+    """Increment the circulation rollups for one borrowed copy."""
+    cur.execute(
+        """
+        INSERT INTO title_circulation (book_id, checkouts, on_loan) VALUES (?, 1, 1)
+        ON CONFLICT(book_id) DO UPDATE SET
+            checkouts = checkouts + 1, on_loan = on_loan + 1
+        """,
+        (book_id,),
+    )
+    for dimension, key in (
+        ("total", ""),
+        ("title", str(book_id)),
+        ("patron", str(patron_id)),
+        ("author", author),
+    ):
+        cur.execute(
+            """
+            INSERT INTO daily_circulation (day, dimension, key, checkouts)
+            VALUES (date('now'), ?, ?, 1)
+            ON CONFLICT(dimension, day, key) DO UPDATE SET checkouts = checkouts + 1
+            """,
+            (dimension, key),
+        )
+    for dimension, key in (("patron", str(patron_id)), ("author", author)):
+        cur.execute(
+            """
+            INSERT INTO circulation_totals (dimension, key, checkouts) VALUES (?, ?, 1)
+            ON CONFLICT(dimension, key) DO UPDATE SET checkouts = checkouts + 1
+            """,
+            (dimension, key),
+        )
+
+
 app = Flask(__name__)
 # Needed for flash() messages
 app.config["SECRET_KEY"] = "dev-secret-change-me"
 
-# Ensure DB exists on startup
-init_db()
+# Report query limits
+MAX_REPORT_TOP = 100
+MAX_REPORT_DAYS = 366
+
+_initialized_db_path = None
+
+
+@app.before_request
+def ensure_db():
+    """Create the DB on first request rather than at import time."""
+    global _initialized_db_path
+    if _initialized_db_path != DB_PATH:
+        init_db()
+        _initialized_db_path = DB_PATH
 
 
 @app.route("/")
@@ -121,7 +256,7 @@ def borrow_book():
             return redirect(url_for("borrow_book"))
 
         cur = conn.cursor()
-        cur.execute("SELECT copies FROM books WHERE id = ?", (book_id,))
+        cur.execute("SELECT copies, author FROM books WHERE id = ?", (book_id,))
         row = cur.fetchone()
 
         if row is None:
@@ -138,6 +273,7 @@ def borrow_book():
                 "UPDATE books SET copies = copies - 1 WHERE id = ?",
                 (book_id,),
             )
+            record_checkout_rollups(cur, book_id, patron_id, row["author"])
             conn.commit()
             flash(
                 f"Book borrowed successfully by patron {patron_id}.",
@@ -155,6 +291,102 @@ def borrow_book():
     return render_template("borrow.html", books=books)
 
 
+@app.route("/reports/circulation")
+def circulation_report():
+    """
+    Top titles/patrons/authors, daily circulation and utilization, served from
+    the rollups. Same shape as LibraryService.circulation_report; with
+    ?dimension=title|patron|author&key=... it also returns that key's daily "series".
+    """
+    try:
+        top_n = int(request.args.get("top", 10))
+        days = int(request.args.get("days", 30))
+    except ValueError:
+        return jsonify({"error": "top and days must be numbers"}), 400
+    if top_n < 1 or days < 1:
+        return jsonify({"error": "top and days must be positive"}), 400
+    if top_n > MAX_REPORT_TOP or days > MAX_REPORT_DAYS:
+        return jsonify(
+            {"error": f"top must be <= {MAX_REPORT_TOP} and days <= {MAX_REPORT_DAYS}"}
+        ), 400
+    dimension = request.args.get("dimension")
+    key = request.args.get("key", "")
+    if dimension is not None and (dimension not in ("title", "patron", "author") or not key):
+        return jsonify({"error": "dimension must be title, patron or author, with a key"}), 400
+
+    conn = get_db()
+    end = date.fromisoformat(conn.execute("SELECT date('now')").fetchone()[0])
+    start = end - timedelta(days=days - 1)
+    window = [(start + timedelta(days=i)).isoformat() for i in range(days)]
+
+    top_titles = conn.execute(
+        """
+        SELECT b.id AS book_id, b.title, b.author, t.checkouts
+        FROM title_circulation t JOIN books b ON b.id = t.book_id
+        ORDER BY t.checkouts DESC LIMIT ?
+        """,
+        (top_n,),
+    ).fetchall()
+    top_totals = {}
+    for dim in ("patron", "author"):
+        top_totals[dim] = conn.execute(
+            """
+            SELECT key, checkouts FROM circulation_totals
+            WHERE dimension = ? ORDER BY checkouts DESC LIMIT ?
+            """,
+            (dim, top_n),
+        ).fetchall()
+
+    def daily_counts(dim, k):
+        rows = conn.execute(
+            """
+            SELECT day, checkouts FROM daily_circulation
+            WHERE dimension = ? AND key = ? AND day BETWEEN ? AND ?
+            """,
+            (dim, k, start.isoformat(), end.isoformat()),
+        ).fetchall()
+        return {r["day"]: r["checkouts"] for r in rows}
+
+    totals_by_day = daily_counts("total", "")
+    series_by_day = daily_counts(dimension, key) if dimension else None
+
+    # books.copies is what is still on the shelf; on_loan restores the total
+    util = conn.execute(
+        """
+        SELECT COALESCE(SUM(b.copies), 0) AS available,
+               COALESCE(SUM(t.on_loan), 0) AS on_loan
+        FROM books b LEFT JOIN title_circulation t ON t.book_id = b.id
+        """
+    ).fetchone()
+    conn.close()
+
+    total = util["available"] + util["on_loan"]
+    report = {
+        "top_titles": [dict(r) for r in top_titles],
+        "top_patrons": [
+            {"patron_id": r["key"], "checkouts": r["checkouts"]} for r in top_totals["patron"]
+        ],
+        "top_authors": [
+            {"author": r["key"], "checkouts": r["checkouts"]} for r in top_totals["author"]
+        ],
+        # the web UI has no return flow yet, so returns are always 0 here
+        "daily": [
+            {"day": d, "checkouts": totals_by_day.get(d, 0), "returns": 0} for d in window
+        ],
+        "utilization": {
+            "copies": total,
+            "available_copies": util["available"],
+            "on_loan": util["on_loan"],
+            "utilization": round(util["on_loan"] / total, 4) if total else 0.0,
+        },
+    }
+    if series_by_day is not None:
+        report["series"] = [
+            {"day": d, "checkouts": series_by_day.get(d, 0)} for d in window
+        ]
+    return jsonify(report)
+
+
 if __name__ == "__main__":
     # Local dev: python app.py
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -1,9 +1,9 @@
 # services.py
 from __future__ import annotations
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import Counter, defaultdict
 from datetime import date, timedelta
-from typing import Dict, List, Tuple, Optional, Hashable
+from typing import Any, Dict, Iterable, List, Tuple, Optional, Hashable
 
 # ---- Assignment constants ----
 DEFAULT_LOAN_DAYS = 14
@@ -54,6 +54,8 @@ class LibraryService:
        - list_overdue_loans(today=...) -> list[(user_id, book_id)]
        - deactivate_user(user_id)
        - remove_book(book_id)   (only when fully available)
+       - circulation_report(top_n=10, start=None, end=None, dimension=None, key=None) -> dict
+       - patron_summary(user_id) / patron_summaries(user_ids) -> cached status dicts
        - public: users: Dict[int, User], books: Dict[Hashable, Book]
 
     B) AI-generated tests API (string ISBNs; booleans instead of exceptions):
@@ -72,6 +74,25 @@ class LibraryService:
         # active loans: (user_id, book_id) -> list of loan dates (one per active copy)
         self._loan_dates: Dict[Tuple[int, Hashable], List[date]] = defaultdict(list)
 
+        # circulation rollups, updated on every checkout/return so reports never
+        # have to scan loan history
+        self._checkouts_by_title: Counter = Counter()
+        self._checkouts_by_patron: Counter = Counter()
+        self._checkouts_by_author: Counter = Counter()
+        self._daily_checkouts: Counter = Counter()
+        self._daily_returns: Counter = Counter()
+        # day -> Counter of key -> checkouts, one map per dimension
+        self._daily_by_title: Dict[date, Counter] = defaultdict(Counter)
+        self._daily_by_patron: Dict[date, Counter] = defaultdict(Counter)
+        self._daily_by_author: Dict[date, Counter] = defaultdict(Counter)
+        self._total_copies = 0
+        self._copies_on_loan = 0
+
+        # user_id -> {book_id: active copies}, kept in step with _loan_dates
+        self._loans_by_user: Dict[int, Dict[Hashable, int]] = defaultdict(dict)
+        # user_id -> cached loan part of the status summary; dropped on checkout/return
+        self._patron_summaries: Dict[int, Dict[str, Any]] = {}
+
     # ---------- Users ----------
     def add_user(self, *args) -> int:
         """
@@ -119,10 +140,13 @@ class LibraryService:
             b = self.books[book_id]
             if not b.is_active:
                 b.is_active = True
+                self._total_copies += b.copies  # retired copies count again
             b.copies += int(copies)
             b.available_copies += int(copies)
+            self._total_copies += int(copies)
             return True
         self.books[book_id] = Book(book_id, title or "", author or "", int(copies), int(copies), True)
+        self._total_copies += int(copies)
         return True
 
     def remove_book(self, book_id: Hashable) -> None:
@@ -131,6 +155,8 @@ class LibraryService:
             raise ValueError("no such book")
         if b.available_copies != b.copies:
             raise ValueError("book has outstanding loans")
+        if b.is_active:
+            self._total_copies -= b.copies
         b.is_active = False
 
     def get_book(self, book_id: Hashable) -> Optional[Book]:
@@ -138,7 +164,7 @@ class LibraryService:
 
     # ---------- Loans (human API: raise on invalid; returns Loan) ----------
     def _active_loans_for_user(self, user_id: int) -> int:
-        return sum(len(dates) for (uid, _), dates in self._loan_dates.items() if uid == user_id)
+        return sum(self._loans_by_user.get(user_id, {}).values())
 
     def checkout_book(self, user_id: int, book_id: Hashable, today: Optional[date] = None) -> Loan:
         today = today or date.today()
@@ -153,8 +179,7 @@ class LibraryService:
         if self._active_loans_for_user(user_id) >= MAX_ACTIVE_LOANS_PER_USER:
             raise ValueError("max active loans reached")
 
-        b.available_copies -= 1
-        self._loan_dates[(user_id, book_id)].append(today)
+        self._record_checkout(user_id, b, today)
         due = today + timedelta(days=DEFAULT_LOAN_DAYS)
         return Loan(user_id=user_id, book_id=book_id, checkout_date=today, due_date=due)
 
@@ -167,15 +192,36 @@ class LibraryService:
         self.books[book_id].available_copies += 1
         if not dates:
             self._loan_dates.pop(key, None)
+        self._copies_on_loan -= 1
+        user_loans = self._loans_by_user[user_id]
+        user_loans[book_id] -= 1
+        if not user_loans[book_id]:
+            del user_loans[book_id]
+        if not user_loans:
+            del self._loans_by_user[user_id]
+        self._patron_summaries.pop(user_id, None)
+        self._daily_returns[return_date or date.today()] += 1
         return True
 
+    def _record_checkout(self, user_id: int, b: Book, day: date) -> None:
+        """Take one copy off the shelf and bump every circulation rollup."""
+        b.available_copies -= 1
+        self._loan_dates[(user_id, b.book_id)].append(day)
+        self._copies_on_loan += 1
+        user_loans = self._loans_by_user[user_id]
+        user_loans[b.book_id] = user_loans.get(b.book_id, 0) + 1
+        self._patron_summaries.pop(user_id, None)
+        self._checkouts_by_title[b.book_id] += 1
+        self._checkouts_by_patron[user_id] += 1
+        self._checkouts_by_author[b.author] += 1
+        self._daily_checkouts[day] += 1
+        self._daily_by_title[day][b.book_id] += 1
+        self._daily_by_patron[day][user_id] += 1
+        self._daily_by_author[day][b.author] += 1
+
     def list_active_loans(self, user_id: int) -> List[Tuple[Hashable, int]]:
         """Return [(book_id, count), ...] for user's active loans."""
-        out: List[Tuple[Hashable, int]] = []
-        for (uid, bid), dates in self._loan_dates.items():
-            if uid == user_id and dates:
-                out.append((bid, len(dates)))
-        return out
+        return list(self._loans_by_user.get(user_id, {}).items())
 
     def list_overdue_loans(self, today: Optional[date] = None) -> List[Tuple[int, Hashable]]:
         """Return [(user_id, book_id), ...] where any copy is overdue."""
@@ -188,6 +234,128 @@ class LibraryService:
                     break
         return overdue
 
+    # ---------- Patron summaries (loan part cached; invalidated on checkout/return) ----------
+    def patron_summary(self, user_id: int) -> Dict[str, Any]:
+        """Status summary for one patron, read from the per-user loan index."""
+        cached = self._patron_summaries.get(user_id)
+        if cached is None:
+            loans = self.list_active_loans(user_id)
+            cached = {"active_loans": loans, "total_active_loan_count": sum(cnt for _, cnt in loans)}
+            if user_id in self.users:  # never cache lookups of unknown IDs
+                self._patron_summaries[user_id] = cached
+        u = self.users.get(user_id)
+        return {
+            "is_active": bool(u and u.is_active),  # read live; users is public
+            "active_loans": list(cached["active_loans"]),
+            "total_active_loan_count": cached["total_active_loan_count"],
+        }
+
+    def patron_summaries(self, user_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Summaries for many patrons in one pass over the requested IDs."""
+        return {uid: self.patron_summary(uid) for uid in dict.fromkeys(user_ids)}
+
+    # ---------- Reporting (served from rollups, independent of loan history) ----------
+    def top_titles(self, n: int = 10) -> List[Tuple[Hashable, int]]:
+        """Return [(book_id, checkouts), ...] for the n most borrowed titles."""
+        return self._checkouts_by_title.most_common(n)
+
+    def daily_checkouts(self, day: date) -> Dict[str, Dict[Hashable, int]]:
+        """Checkouts on a single day broken down by title, patron and author."""
+        return {
+            "by_title": dict(self._daily_by_title.get(day, {})),
+            "by_patron": dict(self._daily_by_patron.get(day, {})),
+            "by_author": dict(self._daily_by_author.get(day, {})),
+        }
+
+    def circulation_curve(self, start: date, end: date) -> List[Tuple[date, int, int]]:
+        """Return [(day, checkouts, returns), ...] for every day in [start, end]."""
+        if end < start:
+            raise ValueError("end must not be before start")
+        out: List[Tuple[date, int, int]] = []
+        day = start
+        while day <= end:
+            out.append((day, self._daily_checkouts[day], self._daily_returns[day]))
+            day += timedelta(days=1)
+        return out
+
+    def daily_series(
+        self, dimension: str, key: Hashable, start: date, end: date
+    ) -> List[Tuple[date, int]]:
+        """Return [(day, checkouts), ...] for one title, patron or author over [start, end]."""
+        by_day = {
+            "title": self._daily_by_title,
+            "patron": self._daily_by_patron,
+            "author": self._daily_by_author,
+        }.get(dimension)
+        if by_day is None:
+            raise ValueError("dimension must be 'title', 'patron' or 'author'")
+        if end < start:
+            raise ValueError("end must not be before start")
+        out: List[Tuple[date, int]] = []
+        day = start
+        while day <= end:
+            counts = by_day.get(day)
+            out.append((day, counts[key] if counts else 0))
+            day += timedelta(days=1)
+        return out
+
+    def utilization(self) -> Dict[str, Any]:
+        """Copies on loan vs copies in the catalog."""
+        total = self._total_copies
+        return {
+            "copies": total,
+            "available_copies": total - self._copies_on_loan,
+            "on_loan": self._copies_on_loan,
+            "utilization": round(self._copies_on_loan / total, 4) if total else 0.0,
+        }
+
+    def circulation_report(
+        self,
+        top_n: int = 10,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        dimension: Optional[str] = None,
+        key: Optional[Hashable] = None,
+    ) -> Dict[str, Any]:
+        """
+        Top titles/patrons/authors, daily curve (defaults to the last 30 days)
+        and utilization, under the same keys as the web app's /reports/circulation
+        (days are date objects here rather than ISO strings).
+        With dimension and key, also a per-day "series" for that title/patron/author.
+        """
+        end = end or date.today()
+        start = start or end - timedelta(days=29)
+        report: Dict[str, Any] = {
+            "top_titles": [
+                {
+                    "book_id": bid,
+                    "title": self.books[bid].title,
+                    "author": self.books[bid].author,
+                    "checkouts": n,
+                }
+                for bid, n in self.top_titles(top_n)
+            ],
+            "top_patrons": [
+                {"patron_id": uid, "checkouts": n}
+                for uid, n in self._checkouts_by_patron.most_common(top_n)
+            ],
+            "top_authors": [
+                {"author": a, "checkouts": n}
+                for a, n in self._checkouts_by_author.most_common(top_n)
+            ],
+            "daily": [
+                {"day": d, "checkouts": c, "returns": r}
+                for d, c, r in self.circulation_curve(start, end)
+            ],
+            "utilization": self.utilization(),
+        }
+        if dimension is not None:
+            report["series"] = [
+                {"day": d, "checkouts": c}
+                for d, c in self.daily_series(dimension, key, start, end)
+            ]
+        return report
+
     # ---------- Search ----------
     def search_books(self, query: str):
         """Case-insensitive substring on title/author; returns list of dicts (AI tests format)."""
@@ -219,8 +387,7 @@ class LibraryService:
             return False
         if self._active_loans_for_user(user_id) >= MAX_ACTIVE_LOANS_PER_USER:
             return False
-        b.available_copies -= 1
-        self._loan_dates[(user_id, isbn)].append(date.today())
+        self._record_checkout(user_id, b, date.today())
         return True
 
 
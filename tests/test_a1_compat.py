@@ -1,9 +1,18 @@
+import pytest
 from datetime import date, timedelta
+import a1_compat
 from a1_compat import (
     register_user, add_book_to_catalog, borrow_book_by_patron,
-    return_book_by_patron, calculate_late_fee_for_book, search_books_in_catalog
+    return_book_by_patron, calculate_late_fee_for_book, search_books_in_catalog,
+    get_patron_status_report, get_patron_status_reports
 )
-from services import DEFAULT_LOAN_DAYS
+from services import LibraryService, DEFAULT_LOAN_DAYS
+
+@pytest.fixture()
+def fresh_lib(monkeypatch):
+    lib = LibraryService()
+    monkeypatch.setattr(a1_compat, "_LIB", lib)
+    return lib
 
 def test_a1_compat_smoke():
     register_user(1, "Alice")
@@ -19,3 +28,32 @@ def test_a1_compat_smoke():
     assert calculate_late_fee_for_book(1, 10, today=date(2025, 10, 1)) == 0.0
 
     assert return_book_by_patron(1, 10, return_date=date(2025, 10, 3)) is True
+
+def test_patron_status_reports_batch(fresh_lib):
+    register_user(2, "Bob")
+    register_user(3, "Carol")
+    add_book_to_catalog("Refactoring", "Fowler", 20, total_copies=2)
+    borrow_book_by_patron(2, 20, today=date(2025, 10, 1))
+
+    reports = get_patron_status_reports([2, 3, 2, 99])
+    assert list(reports) == [2, 3, 99]  # duplicates collapsed, order kept
+    assert reports[2] == {"is_active": True, "active_loans": [(20, 1)], "total_active_loan_count": 1}
+    assert reports[3]["total_active_loan_count"] == 0
+    assert reports[99] == {"is_active": False, "active_loans": [], "total_active_loan_count": 0}
+
+def test_patron_status_report_follows_checkout_return_and_status(fresh_lib):
+    register_user(2, "Bob")
+    add_book_to_catalog("Refactoring", "Fowler", 20, total_copies=2)
+    assert get_patron_status_report(2)["active_loans"] == []
+
+    borrow_book_by_patron(2, 20, today=date(2025, 10, 1))
+    borrow_book_by_patron(2, 20, today=date(2025, 10, 1))
+    assert get_patron_status_report(2)["active_loans"] == [(20, 2)]
+
+    return_book_by_patron(2, 20, return_date=date(2025, 10, 2))
+    assert get_patron_status_report(2)["total_active_loan_count"] == 1
+
+    fresh_lib.deactivate_user(2)
+    assert get_patron_status_report(2)["is_active"] is False
+    fresh_lib.users[2].is_active = True  # direct writes to the public map
+    assert get_patron_status_report(2)["is_active"] is True
@@ -0,0 +1,99 @@
+import sqlite3
+import pytest
+
+pytest.importorskip("flask")
+import app as app_module
+
+
+@pytest.fixture()
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "DB_PATH", str(tmp_path / "library.db"))
+    app_module.init_db()
+    app_module.app.config["TESTING"] = True
+    return app_module.app.test_client()
+
+
+def add_and_get_id(client, title, author, copies):
+    client.post("/books/add", data={"title": title, "author": author, "isbn": "1", "copies": copies})
+    conn = app_module.get_db()
+    book_id = conn.execute("SELECT id FROM books WHERE title = ?", (title,)).fetchone()["id"]
+    conn.close()
+    return book_id
+
+
+def test_circulation_report_after_two_borrows(client):
+    book_id = add_and_get_id(client, "Clean Code", "Martin", "3")
+    client.post("/borrow", data={"book_id": book_id, "patron_id": "p1"})
+    client.post("/borrow", data={"book_id": book_id, "patron_id": "p2"})
+
+    report = client.get("/reports/circulation?top=5&days=7").get_json()
+    assert report["top_titles"] == [
+        {"book_id": book_id, "title": "Clean Code", "author": "Martin", "checkouts": 2}
+    ]
+    assert report["top_authors"] == [{"author": "Martin", "checkouts": 2}]
+    assert {p["patron_id"] for p in report["top_patrons"]} == {"p1", "p2"}
+    assert len(report["daily"]) == 7
+    assert report["daily"][-1]["checkouts"] == 2
+    assert report["utilization"] == {
+        "copies": 3, "available_copies": 1, "on_loan": 2, "utilization": 0.6667
+    }
+
+
+def test_circulation_report_series_for_one_key(client):
+    book_id = add_and_get_id(client, "Refactoring", "Fowler", "2")
+    client.post("/borrow", data={"book_id": book_id, "patron_id": "p1"})
+
+    report = client.get("/reports/circulation?days=2&dimension=patron&key=p1").get_json()
+    assert [s["checkouts"] for s in report["series"]] == [0, 1]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "top=abc", "top=0", "days=-1", "dimension=shelf&key=x", "dimension=author",
+        "days=367", "days=1000000", "top=101", "top=99999999999999999999999",
+    ],
+)
+def test_circulation_report_rejects_bad_params(client, query):
+    assert client.get(f"/reports/circulation?{query}").status_code == 400
+
+
+def test_series_query_uses_key_and_day_range(client):
+    conn = app_module.get_db()
+    plan = " ".join(
+        r["detail"]
+        for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT day, checkouts FROM daily_circulation "
+            "WHERE dimension = ? AND key = ? AND day BETWEEN ? AND ?",
+            ("patron", "p1", "2025-01-01", "2025-01-31"),
+        )
+    )
+    conn.close()
+    assert "key=?" in plan and "day>?" in plan and "day<?" in plan
+
+
+def test_rollups_backfilled_from_existing_loans(tmp_path, monkeypatch):
+    db = tmp_path / "old.db"
+    conn = sqlite3.connect(db)
+    conn.executescript(
+        """
+        CREATE TABLE books (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL,
+            author TEXT NOT NULL, isbn TEXT NOT NULL, copies INTEGER NOT NULL);
+        CREATE TABLE loans (id INTEGER PRIMARY KEY AUTOINCREMENT, book_id INTEGER NOT NULL,
+            patron_id TEXT NOT NULL, loan_date TEXT DEFAULT CURRENT_TIMESTAMP);
+        INSERT INTO books (title, author, isbn, copies) VALUES ('DDD', 'Evans', '9', 1);
+        INSERT INTO loans (book_id, patron_id) VALUES (1, 'p1'), (1, 'p2');
+        """
+    )
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(app_module, "DB_PATH", str(db))
+    app_module.init_db()
+    app_module.init_db()  # second start must not double count
+    report = app_module.app.test_client().get("/reports/circulation?days=1").get_json()
+    assert report["top_titles"][0]["checkouts"] == 2
+    assert report["top_authors"] == [{"author": "Evans", "checkouts": 2}]
+    assert report["daily"][0]["checkouts"] == 2
+    assert report["utilization"]["on_loan"] == 2
+    assert report["utilization"]["copies"] == 3
@@ -61,3 +61,35 @@ def test_return_and_overdue(lib):
     lib.return_book(2, 10, return_date=date(2025, 10, 2))
     assert len(lib.list_active_loans(2)) == 0
     assert lib.books[10].available_copies == 2
+
+def test_circulation_rollups(lib):
+    d1, d2 = date(2025, 10, 1), date(2025, 10, 2)
+    lib.checkout_book(1, 10, today=d1)
+    lib.checkout_book(2, 10, today=d1)
+    lib.checkout_book(1, 11, today=d2)
+    lib.return_book(2, 10, return_date=d2)
+
+    assert lib.top_titles(1) == [(10, 2)]
+    assert lib.daily_checkouts(d1) == {
+        "by_title": {10: 2},
+        "by_patron": {1: 1, 2: 1},
+        "by_author": {"Martin": 2},
+    }
+    assert lib.circulation_curve(d1, d2) == [(d1, 2, 0), (d2, 1, 1)]
+    util = lib.utilization()
+    assert util["copies"] == 3 and util["on_loan"] == 2 and util["available_copies"] == 1
+
+    report = lib.circulation_report(top_n=2, start=d1, end=d2, dimension="patron", key=1)
+    assert report["top_titles"][0] == {"book_id": 10, "title": "Clean Code", "author": "Martin", "checkouts": 2}
+    assert report["top_authors"][0] == {"author": "Martin", "checkouts": 2}
+    assert report["daily"][1] == {"day": d2, "checkouts": 1, "returns": 1}
+    assert report["series"] == [{"day": d1, "checkouts": 1}, {"day": d2, "checkouts": 1}]
+
+def test_utilization_tracks_removed_and_readded_books(lib):
+    lib.checkout_book(1, 11, today=date(2025, 10, 1))
+    lib.return_book(1, 11, return_date=date(2025, 10, 2))
+    lib.remove_book(11)
+    assert lib.utilization()["copies"] == 2
+    lib.add_book(11, "Refactoring", "Fowler", copies=1)
+    assert lib.utilization()["copies"] == 4
+    assert lib.utilization()["available_copies"] == 4